@@ -41,15 +41,27 @@ def main():
                            help='Фильтр по приоритету')
     list_parser.add_argument('-s', '--status', choices=['active', 'archived'], 
                            default='active', help='Статус заметок')
-    list_parser.add_argument('--full', action='store_true', 
+    list_parser.add_argument('--full', action='store_true',
                            help='Показать полное содержимое')
+    list_parser.add_argument('--limit', type=int, default=50,
+                           help='Сколько заметок показывать')
+    list_parser.add_argument('--offset', type=int, default=0,
+                           help='Сколько заметок пропустить')
+    list_parser.add_argument('--short', action='store_true',
+                           help='Компактный вывод: одна строка на заметку')
     
     # Команда поиска
     search_parser = subparsers.add_parser('search', help='Поиск заметок')
     search_parser.add_argument('search_term', help='Текст для поиска')
-    search_parser.add_argument('--in', dest='search_in', 
+    search_parser.add_argument('--in', dest='search_in',
                              choices=['title', 'content', 'tags', 'all'],
                              default='all', help='Где искать')
+    search_parser.add_argument('--limit', type=int, default=50,
+                             help='Сколько результатов показывать')
+    search_parser.add_argument('--offset', type=int, default=0,
+                             help='Сколько результатов пропустить')
+    search_parser.add_argument('-w', '--word', action='store_true',
+                             help='Искать только целые слова (по всем полям)')
     
     # Команда удаления
     delete_parser = subparsers.add_parser('delete', help='Удалить заметку')
@@ -98,12 +110,18 @@ def main():
                 category=args.category,
                 priority=args.priority,
                 status=args.status,
-                show_content=args.full
+                show_content=args.full,
+                limit=args.limit,
+                offset=args.offset,
+                verbose=not args.short
             )
         elif args.command == 'search':
             result = commands.search_notes(
                 search_term=args.search_term,
-                search_in=args.search_in
+                search_in=args.search_in,
+                limit=args.limit,
+                offset=args.offset,
+                whole_words=args.word
             )
         elif args.command == 'delete':
             result = commands.delete_note(args.note_id)
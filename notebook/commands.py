@@ -6,11 +6,20 @@
 
 
 import argparse
+from functools import lru_cache
+from operator import attrgetter
 from typing import List
 from datetime import datetime
 from .models import Note, NoteStatus, NotePriority, NoteCategory  # Используем относительные импорты
+from .models import _CATEGORY_BY_VALUE, _PRIORITY_BY_VALUE, _STATUS_BY_VALUE
 from .storage import NoteStorage  # Используем относительные импорты
 
+# Перечни допустимых значений для сообщений об ошибках;
+# собираются один раз при импорте, а не при каждом неверном вводе
+_VALID_CATEGORIES = ', '.join(category.value for category in NoteCategory)
+_VALID_PRIORITIES = ', '.join(priority.value for priority in NotePriority)
+_VALID_STATUSES = ', '.join(status.value for status in NoteStatus)
+
 
 class NoteCommands:
     """Класс для обработки команд управления заметками."""
@@ -40,20 +49,15 @@ class NoteCommands:
         Raises:
             ValueError: Если категория или приоритет имеют некорректное значение.
         """
-        notes = self.storage.load_notes()
-        
         # Валидация категории
-        try:
-            note_category = NoteCategory(category.lower())
-        except ValueError:
-            valid_categories = [cat.value for cat in NoteCategory]
-            return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {', '.join(valid_categories)}"
-        
+        note_category = _CATEGORY_BY_VALUE.get(category.lower())
+        if note_category is None:
+            return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {_VALID_CATEGORIES}"
+
         # Валидация приоритета
-        try:
-            note_priority = NotePriority(priority.lower())
-        except ValueError:
-            return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: low, medium, high"
+        note_priority = _PRIORITY_BY_VALUE.get(priority.lower())
+        if note_priority is None:
+            return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: {_VALID_PRIORITIES}"
         
         new_note = Note(
             id=self.storage.get_next_id(),
@@ -64,112 +68,237 @@ class NoteCommands:
             tags=tags or []
         )
         
-        notes.append(new_note)
-        self.storage.save_notes(notes)
+        self.storage.append_note(new_note)
         return f"Заметка добавлена (ID: {new_note.id}): {title}"
-    
-    def list_notes(self, category: str = None, priority: str = None, 
-                   status: str = "active", show_content: bool = False) -> str:
+
+    def add_notes_bulk(self, specs: List[dict]) -> str:
+        """Добавляет несколько заметок одной операцией записи.
+
+        Весь пакет валидируется и сохраняется целиком: при ошибке в
+        любой записи ни одна заметка не добавляется, а файл
+        переписывается один раз вместо раза на каждую заметку.
+
+        Args:
+            specs (List[dict]): Описания заметок. Каждое содержит
+                title и content, опционально category, priority и tags.
+
+        Returns:
+            str: Сообщение о результате операции.
+        """
+        if not specs:
+            return "Нет заметок для добавления"
+
+        next_id = self.storage.get_next_id()
+        new_notes = []
+        for position, spec in enumerate(specs, start=1):
+            category = spec.get('category', 'other')
+            note_category = _CATEGORY_BY_VALUE.get(category.lower())
+            if note_category is None:
+                return (f"Ошибка в записи {position}: Неверная категория '{category}'. "
+                        f"Допустимые значения: {_VALID_CATEGORIES}")
+
+            priority = spec.get('priority', 'medium')
+            note_priority = _PRIORITY_BY_VALUE.get(priority.lower())
+            if note_priority is None:
+                return (f"Ошибка в записи {position}: Неверный приоритет '{priority}'. "
+                        f"Допустимые значения: {_VALID_PRIORITIES}")
+
+            new_notes.append(Note(
+                id=next_id,
+                title=spec['title'],
+                content=spec['content'],
+                category=note_category,
+                priority=note_priority,
+                tags=spec.get('tags') or []
+            ))
+            next_id += 1
+
+        self.storage.append_many(new_notes)
+        return f"Добавлено заметок: {len(new_notes)} (ID: {new_notes[0].id}-{new_notes[-1].id})"
+
+    @lru_cache(maxsize=32)
+    def _filter_sort(self, category_filter, priority_filter, status_filter, version):
+        """Фильтрует и сортирует заметки, кэшируя результат по версии данных.
+
+        Результат мемоизируется по комбинации фильтров и номеру версии
+        хранилища: пока заметки не менялись, повторные вызовы с теми же
+        фильтрами не перебирают и не сортируют список заново.
+
+        Args:
+            category_filter (NoteCategory, optional): Фильтр по категории.
+            priority_filter (NotePriority, optional): Фильтр по приоритету.
+            status_filter (NoteStatus, optional): Фильтр по статусу.
+            version (int): Номер версии данных хранилища.
+
+        Returns:
+            tuple: ID подходящих заметок в порядке убывания даты создания.
+        """
+        # Один проход по колонкам атрибутов; колонки уже отсортированы
+        # по дате создания, поэтому повторная сортировка не нужна
+        ids, categories, priorities, statuses = self.storage.get_columns()
+        return tuple(
+            note_id
+            for note_id, note_category, note_priority, note_status
+            in zip(ids, categories, priorities, statuses)
+            if (category_filter is None or note_category is category_filter)
+            and (priority_filter is None or note_priority is priority_filter)
+            and (status_filter is None or note_status is status_filter)
+        )
+
+    def list_notes(self, category: str = None, priority: str = None,
+                   status: str = "active", show_content: bool = False,
+                   limit: int = 50, offset: int = 0,
+                   verbose: bool = True) -> str:
         """Показывает список заметок с возможностью фильтрации.
-        
+
         Args:
             category (str, optional): Фильтр по категории.
             priority (str, optional): Фильтр по приоритету.
             status (str, optional): Фильтр по статусу. По умолчанию "active".
             show_content (bool, optional): Показывать полный текст. По умолчанию False.
-            
+            limit (int, optional): Сколько заметок показывать. По умолчанию 50.
+            offset (int, optional): Сколько заметок пропустить. По умолчанию 0.
+            verbose (bool, optional): Полное оформление со значками; при
+                False — компактная строка на заметку. По умолчанию True.
+
         Returns:
             str: Отформатированный список заметок.
         """
+        if limit < 1:
+            return f"Ошибка: Неверное значение limit '{limit}'. Должно быть положительным числом"
+        offset = max(0, offset)
+
         notes = self.storage.load_notes()
-        
+
         if not notes:
             return "Нет заметок"
-        
-        # Фильтрация
-        filtered_notes = notes
-        
+
+        # Разрешаем фильтры заранее, чтобы по заметкам был один проход
+        category_filter = None
         if category:
-            try:
-                category_filter = NoteCategory(category.lower())
-                filtered_notes = [n for n in filtered_notes if n.category == category_filter]
-            except ValueError:
-                valid_categories = [cat.value for cat in NoteCategory]
-                return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {', '.join(valid_categories)}"
-        
+            category_filter = _CATEGORY_BY_VALUE.get(category.lower())
+            if category_filter is None:
+                return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {_VALID_CATEGORIES}"
+
+        priority_filter = None
         if priority:
-            try:
-                priority_filter = NotePriority(priority.lower())
-                filtered_notes = [n for n in filtered_notes if n.priority == priority_filter]
-            except ValueError:
-                return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: low, medium, high"
-        
+            priority_filter = _PRIORITY_BY_VALUE.get(priority.lower())
+            if priority_filter is None:
+                return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: {_VALID_PRIORITIES}"
+
+        status_filter = None
         if status:
-            try:
-                status_filter = NoteStatus(status.lower())
-                filtered_notes = [n for n in filtered_notes if n.status == status_filter]
-            except ValueError:
-                return f"Ошибка: Неверный статус '{status}'. Допустимые значения: active, archived"
-        
-        if not filtered_notes:
+            status_filter = _STATUS_BY_VALUE.get(status.lower())
+            if status_filter is None:
+                return f"Ошибка: Неверный статус '{status}'. Допустимые значения: {_VALID_STATUSES}"
+
+        note_ids = self._filter_sort(
+            category_filter, priority_filter, status_filter,
+            self.storage.get_version()
+        )
+
+        if not note_ids:
             return "Заметки не найдены по заданным критериям"
-        
-        # Сортировка по дате создания (новые сначала)
-        filtered_notes.sort(key=lambda x: x.created_at, reverse=True)
-        
+
+        # Форматируется только запрошенная страница, а не весь список
+        page_ids = note_ids[offset:offset + limit]
+        if not page_ids:
+            return f"Нет заметок со смещением {offset} (всего найдено: {len(note_ids)})"
+
         result = []
-        result.append(f"=== Найдено заметок: {len(filtered_notes)} ===")
-        
-        for note in filtered_notes:
+        result.append(f"=== Найдено заметок: {len(note_ids)} ===")
+        if len(page_ids) < len(note_ids):
+            result.append(f"Показаны {offset + 1}-{offset + len(page_ids)}")
+
+        for note_id in page_ids:
+            note = self.storage.get_by_id(note_id)
+            if not verbose:
+                result.append(note.short_repr())
+                continue
             result.append("─" * 50)
             result.append(str(note))
             if show_content and len(note.content) > 100:
                 result.append(f"   Полный текст: {note.content}")
-        
+
         return "\n".join(result)
     
-    def search_notes(self, search_term: str, search_in: str = "all") -> str:
+    def search_notes(self, search_term: str, search_in: str = "all",
+                     limit: int = 50, offset: int = 0,
+                     whole_words: bool = False) -> str:
         """Выполняет поиск заметок по ключевым словам.
-        
+
+        По умолчанию совпадением считается вхождение подстроки: запрос
+        находит и части слов (запрос "work" найдет и "Networking").
+        В режиме whole_words каждое слово запроса должно встречаться в
+        заметке целиком; такой поиск идет через инвертированный индекс
+        и не сканирует текст заметок.
+
         Args:
             search_term (str): Текст для поиска.
             search_in (str, optional): Область поиска. По умолчанию "all".
                 Допустимые значения: "title", "content", "tags", "all".
-                
+            limit (int, optional): Сколько результатов показывать. По умолчанию 50.
+            offset (int, optional): Сколько результатов пропустить. По умолчанию 0.
+            whole_words (bool, optional): Искать только целые слова
+                (по всем полям). По умолчанию False.
+
         Returns:
             str: Отформатированные результаты поиска.
         """
+        if limit < 1:
+            return f"Ошибка: Неверное значение limit '{limit}'. Должно быть положительным числом"
+        offset = max(0, offset)
+
         notes = self.storage.load_notes()
-        
+
         if not notes:
             return "Нет заметок"
-        
+
         search_term = search_term.lower()
-        found_notes = []
-        
-        for note in notes:
-            matches = False
-            
-            if search_in in ["all", "title"] and search_term in note.title.lower():
-                matches = True
-            elif search_in in ["all", "content"] and search_term in note.content.lower():
-                matches = True
-            elif search_in in ["all", "tags"] and any(search_term in tag.lower() for tag in note.tags):
-                matches = True
-            
-            if matches:
-                found_notes.append(note)
+
+        if whole_words:
+            if search_in != "all":
+                return "Ошибка: Пословный поиск работает только по всем полям (--in all)"
+            note_ids = self.storage.search_index(search_term)
+            if note_ids is None:
+                return (f"Ошибка: Для пословного поиска нужны слова длиной не короче "
+                        f"{NoteStorage.MIN_TOKEN_LENGTH} символов")
+            found_notes = [self.storage.get_by_id(note_id) for note_id in note_ids]
+        elif search_in == "all":
+            # Поиск по всем полям: одна проверка подстроки по склеенному
+            # тексту заметки вместо обхода полей по отдельности
+            found_notes = [note for note in notes if search_term in note.search_blob]
+        else:
+            in_title = search_in == "title"
+            in_content = search_in == "content"
+            in_tags = search_in == "tags"
+
+            # Заметки хранят текст в нижнем регистре в кэше, поэтому
+            # при каждом запросе приводится только сам поисковый запрос
+            found_notes = [
+                note for note in notes
+                if (in_title and search_term in note.title_lc)
+                or (in_content and search_term in note.content_lc)
+                or (in_tags and any(search_term in tag for tag in note.tags_lc))
+            ]
         
         if not found_notes:
             return f"Заметки по запросу '{search_term}' не найдены"
-        
-        found_notes.sort(key=lambda x: x.created_at, reverse=True)
-        
+
+        found_notes.sort(key=attrgetter('created_at'), reverse=True)
+
+        # Форматируется только запрошенная страница результатов
+        page = found_notes[offset:offset + limit]
+        if not page:
+            return f"Нет результатов со смещением {offset} (всего найдено: {len(found_notes)})"
+
         result = [f"=== Результаты поиска: '{search_term}' ({len(found_notes)} найдено) ==="]
-        for note in found_notes:
+        if len(page) < len(found_notes):
+            result.append(f"Показаны {offset + 1}-{offset + len(page)}")
+        for note in page:
             result.append("─" * 50)
             result.append(str(note))
-        
+
         return "\n".join(result)
     
     def delete_note(self, note_id: int) -> str:
@@ -181,16 +310,14 @@ class NoteCommands:
         Returns:
             str: Сообщение о результате операции.
         """
+        note = self.storage.get_by_id(note_id)
+        if note is None:
+            return f"Ошибка: Заметка с ID #{note_id} не найдена"
+
         notes = self.storage.load_notes()
-        
-        for i, note in enumerate(notes):
-            if note.id == note_id:
-                deleted_title = note.title
-                del notes[i]
-                self.storage.save_notes(notes)
-                return f"Заметка удалена: #{note_id} - {deleted_title}"
-        
-        return f"Ошибка: Заметка с ID #{note_id} не найдена"
+        notes.remove(note)
+        self.storage.save_notes(notes)
+        return f"Заметка удалена: #{note_id} - {note.title}"
     
     def archive_note(self, note_id: int) -> str:
         """Перемещает заметку в архив.
@@ -201,18 +328,16 @@ class NoteCommands:
         Returns:
             str: Сообщение о результате операции.
         """
-        notes = self.storage.load_notes()
-        
-        for note in notes:
-            if note.id == note_id:
-                if note.status == NoteStatus.ARCHIVED:
-                    return f"Заметка #{note_id} уже в архиве"
-                note.status = NoteStatus.ARCHIVED
-                note.updated_at = datetime.now().isoformat()
-                self.storage.save_notes(notes)
-                return f"Заметка архивирована: #{note_id} - {note.title}"
-        
-        return f"Ошибка: Заметка с ID #{note_id} не найдена"
+        note = self.storage.get_by_id(note_id)
+        if note is None:
+            return f"Ошибка: Заметка с ID #{note_id} не найдена"
+
+        if note.status == NoteStatus.ARCHIVED:
+            return f"Заметка #{note_id} уже в архиве"
+        note.status = NoteStatus.ARCHIVED
+        note.updated_at = datetime.now().isoformat()
+        self.storage.save_notes(self.storage.load_notes())
+        return f"Заметка архивирована: #{note_id} - {note.title}"
     
     def edit_note(self, note_id: int, title: str = None, content: str = None, 
                   category: str = None, priority: str = None, tags: List[str] = None) -> str:
@@ -229,39 +354,37 @@ class NoteCommands:
         Returns:
             str: Сообщение о результате операции.
         """
-        notes = self.storage.load_notes()
-        
-        for note in notes:
-            if note.id == note_id:
-                # Валидация категории
-                note_category = None
-                if category:
-                    try:
-                        note_category = NoteCategory(category.lower())
-                    except ValueError:
-                        valid_categories = [cat.value for cat in NoteCategory]
-                        return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {', '.join(valid_categories)}"
-                
-                # Валидация приоритета
-                note_priority = None
-                if priority:
-                    try:
-                        note_priority = NotePriority(priority.lower())
-                    except ValueError:
-                        return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: low, medium, high"
-                
-                note.update(
-                    title=title,
-                    content=content,
-                    category=note_category,
-                    priority=note_priority,
-                    tags=tags
-                )
-                
-                self.storage.save_notes(notes)
-                return f"Заметка обновлена: #{note_id} - {note.title}"
-        
-        return f"Ошибка: Заметка с ID #{note_id} не найдена"
+        note = self.storage.get_by_id(note_id)
+        if note is None:
+            return f"Ошибка: Заметка с ID #{note_id} не найдена"
+
+        # Валидация категории
+        note_category = None
+        if category:
+            note_category = _CATEGORY_BY_VALUE.get(category.lower())
+            if note_category is None:
+                return f"Ошибка: Неверная категория '{category}'. Допустимые значения: {_VALID_CATEGORIES}"
+
+        # Валидация приоритета
+        note_priority = None
+        if priority:
+            note_priority = _PRIORITY_BY_VALUE.get(priority.lower())
+            if note_priority is None:
+                return f"Ошибка: Неверный приоритет '{priority}'. Допустимые значения: {_VALID_PRIORITIES}"
+
+        changed = note.update(
+            title=title,
+            content=content,
+            category=note_category,
+            priority=note_priority,
+            tags=tags
+        )
+
+        if not changed:
+            return f"Заметка #{note_id} не изменилась"
+
+        self.storage.save_notes(self.storage.load_notes())
+        return f"Заметка обновлена: #{note_id} - {note.title}"
     
     def list_tags(self) -> str:
         """Показывает все используемые теги с количеством заметок.
@@ -269,15 +392,13 @@ class NoteCommands:
         Returns:
             str: Отформатированный список тегов.
         """
-        tags = self.storage.get_all_tags()
-        
-        if not tags:
+        tags_with_counts = self.storage.get_all_tags_with_counts()
+
+        if not tags_with_counts:
             return "Теги не найдены"
-        
+
         result = ["=== Все теги ==="]
-        for tag in tags:
-            # Находим заметки с этим тегом
-            notes_with_tag = [note for note in self.storage.load_notes() if tag in note.tags]
-            result.append(f"#{tag} ({len(notes_with_tag)} заметок)")
-        
+        for tag, count in tags_with_counts:
+            result.append(f"#{tag} ({count} заметок)")
+
         return "\n".join(result)
\ No newline at end of file
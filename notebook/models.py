@@ -6,25 +6,25 @@
 
 import json
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class NoteStatus(Enum):
+class NoteStatus(StrEnum):
     """Перечисление статусов заметки."""
-    
+
     ACTIVE = "active"
     ARCHIVED = "archived"
 
 
-class NotePriority(Enum):
+class NotePriority(StrEnum):
     """Перечисление уровней приоритета заметки."""
-    
+
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
 
-class NoteCategory(Enum):
+class NoteCategory(StrEnum):
     """Перечисление категорий заметок."""
     
     WORK = "work"
@@ -35,6 +35,29 @@ class NoteCategory(Enum):
     OTHER = "other"
 
 
+# Отображения значение→член перечисления: прямой доступ по словарю
+# быстрее, чем вызов Enum.__call__ на каждую запись при загрузке.
+_CATEGORY_BY_VALUE = {category.value: category for category in NoteCategory}
+_PRIORITY_BY_VALUE = {priority.value: priority for priority in NotePriority}
+_STATUS_BY_VALUE = {status.value: status for status in NoteStatus}
+
+# Таблицы значков для __str__: создаются один раз, а не при каждом вызове
+_PRIORITY_ICON = {
+    NotePriority.LOW: "⬇",
+    NotePriority.MEDIUM: "●",
+    NotePriority.HIGH: "⬆"
+}
+
+_CATEGORY_ICON = {
+    NoteCategory.WORK: "💼",
+    NoteCategory.PERSONAL: "👤",
+    NoteCategory.STUDY: "📚",
+    NoteCategory.SHOPPING: "🛒",
+    NoteCategory.IDEAS: "💡",
+    NoteCategory.OTHER: "📄"
+}
+
+
 class Note:
     """Класс, представляющий заметку в системе.
     
@@ -49,7 +72,12 @@ class Note:
         created_at (str): Время создания в формате ISO.
         updated_at (str): Время последнего обновления в формате ISO.
     """
-    
+
+    __slots__ = ('id', 'title', 'content', 'category', 'priority', 'tags',
+                 'status', 'created_at', 'updated_at',
+                 '_title_lc', '_content_lc', '_tags_lc', '_search_blob',
+                 '_created_display')
+
     def __init__(self, id, title, content, category=NoteCategory.OTHER, 
                  priority=NotePriority.MEDIUM, tags=None, status=NoteStatus.ACTIVE,
                  created_at=None, updated_at=None):
@@ -75,7 +103,49 @@ class Note:
         self.status = status
         self.created_at = created_at or datetime.now().isoformat()
         self.updated_at = updated_at or datetime.now().isoformat()
-    
+        # Ленивые копии текста в нижнем регистре для поиска
+        self._title_lc = None
+        self._content_lc = None
+        self._tags_lc = None
+        self._search_blob = None
+        # Дата создания для отображения; created_at не меняется,
+        # поэтому строка разбирается и форматируется один раз
+        self._created_display = None
+
+    @property
+    def title_lc(self):
+        """str: Заголовок в нижнем регистре (кэшируется для поиска)."""
+        if self._title_lc is None:
+            self._title_lc = self.title.lower()
+        return self._title_lc
+
+    @property
+    def content_lc(self):
+        """str: Текст заметки в нижнем регистре (кэшируется для поиска)."""
+        if self._content_lc is None:
+            self._content_lc = self.content.lower()
+        return self._content_lc
+
+    @property
+    def tags_lc(self):
+        """list: Теги в нижнем регистре (кэшируются для поиска)."""
+        if self._tags_lc is None:
+            self._tags_lc = [tag.lower() for tag in self.tags]
+        return self._tags_lc
+
+    @property
+    def search_blob(self):
+        """str: Весь текст заметки в нижнем регистре одной строкой.
+
+        Заголовок, текст и теги, склеенные через перевод строки: поиск
+        по всем полям сводится к одной C-уровневой проверке подстроки
+        вместо обхода полей по отдельности.
+        """
+        if self._search_blob is None:
+            self._search_blob = "\n".join([self.title_lc, self.content_lc, *self.tags_lc])
+        return self._search_blob
+
+
     def to_dict(self):
         """Преобразует объект заметки в словарь для сериализации.
         
@@ -105,44 +175,76 @@ class Note:
             Note: Новый объект заметки.
             
         Raises:
-            KeyError: Если в словаре отсутствуют обязательные поля.
-            ValueError: Если значения категории, приоритета или статуса некорректны.
+            KeyError: Если в словаре отсутствуют обязательные поля либо
+                значения категории, приоритета или статуса некорректны.
         """
         return cls(
             id=data['id'],
             title=data['title'],
             content=data['content'],
-            category=NoteCategory(data['category']),
-            priority=NotePriority(data['priority']),
+            category=_CATEGORY_BY_VALUE[data['category']],
+            priority=_PRIORITY_BY_VALUE[data['priority']],
             tags=data.get('tags', []),
-            status=NoteStatus(data['status']),
+            status=_STATUS_BY_VALUE[data['status']],
             created_at=data.get('created_at'),
             updated_at=data.get('updated_at')
         )
     
     def update(self, title=None, content=None, category=None, priority=None, tags=None):
         """Обновляет данные заметки.
-        
+
+        Поля, совпадающие с текущими значениями, не трогаются; если не
+        изменилось ни одно поле, updated_at тоже остается прежним.
+
         Args:
             title (str, optional): Новый заголовок.
             content (str, optional): Новый текст.
             category (NoteCategory, optional): Новая категория.
             priority (NotePriority, optional): Новый приоритет.
             tags (list, optional): Новый список тегов.
+
+        Returns:
+            bool: True, если хотя бы одно поле изменилось.
         """
-        if title is not None:
+        changed = False
+        if title is not None and title != self.title:
             self.title = title
-        if content is not None:
+            self._title_lc = None
+            self._search_blob = None
+            changed = True
+        if content is not None and content != self.content:
             self.content = content
-        if category is not None:
+            self._content_lc = None
+            self._search_blob = None
+            changed = True
+        if category is not None and category is not self.category:
             self.category = category
-        if priority is not None:
+            changed = True
+        if priority is not None and priority is not self.priority:
             self.priority = priority
-        if tags is not None:
+            changed = True
+        if tags is not None and tags != self.tags:
             self.tags = tags
-        
-        self.updated_at = datetime.now().isoformat()
+            self._tags_lc = None
+            self._search_blob = None
+            changed = True
+
+        if changed:
+            self.updated_at = datetime.now().isoformat()
+        return changed
     
+    def short_repr(self):
+        """Возвращает компактное однострочное представление заметки.
+
+        Без значков и многострочного оформления: одна f-строка вместо
+        десятка промежуточных строк в __str__, удобно для вывода
+        длинных списков.
+
+        Returns:
+            str: Краткая строка вида "#1 [H] work: Заголовок".
+        """
+        return f"#{self.id} [{self.priority.value[0].upper()}] {self.category.value}: {self.title}"
+
     def __str__(self):
         """Возвращает строковое представление заметки.
         
@@ -150,24 +252,14 @@ class Note:
             str: Форматированное строковое представление заметки.
         """
         status_icon = "📁" if self.status == NoteStatus.ARCHIVED else "📝"
-        priority_icon = {
-            NotePriority.LOW: "⬇",
-            NotePriority.MEDIUM: "●",
-            NotePriority.HIGH: "⬆"
-        }.get(self.priority, "●")
-        
-        category_icon = {
-            NoteCategory.WORK: "💼",
-            NoteCategory.PERSONAL: "👤",
-            NoteCategory.STUDY: "📚",
-            NoteCategory.SHOPPING: "🛒",
-            NoteCategory.IDEAS: "💡",
-            NoteCategory.OTHER: "📄"
-        }.get(self.category, "📄")
-        
+        priority_icon = _PRIORITY_ICON.get(self.priority, "●")
+        category_icon = _CATEGORY_ICON.get(self.category, "📄")
+
         tags_str = f" | Tags: {', '.join(self.tags)}" if self.tags else ""
-        created = datetime.fromisoformat(self.created_at).strftime("%d.%m.%Y")
-        
+        if self._created_display is None:
+            self._created_display = datetime.fromisoformat(self.created_at).strftime("%d.%m.%Y")
+        created = self._created_display
+
         return (f"{status_icon} [{priority_icon}] {category_icon} #{self.id}: {self.title}\n"
                 f"   Created: {created}{tags_str}\n"
                 f"   {self.content[:100]}{'...' if len(self.content) > 100 else ''}")
\ No newline at end of file
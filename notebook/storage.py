@@ -6,24 +6,149 @@
 
 import json
 import os
-from typing import List, Optional
+import re
+from bisect import insort
+from collections import Counter
+from operator import attrgetter
+from typing import List, Optional, Set, Tuple
+
+try:
+    import orjson  # C-ускоренный парсер, используется при наличии
+except ImportError:
+    orjson = None
+
 from .models import Note, NoteStatus, NotePriority, NoteCategory
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# Ключ порядка хранения заметок в кэше (по дате создания, по возрастанию)
+_CREATED_KEY = attrgetter('created_at')
+
 
 class NoteStorage:
     """Класс для управления хранилищем заметок.
-    
+
     Attributes:
         filename (str): Имя файла для хранения данных.
     """
-    
+
+    #: Минимальная длина слова, попадающего в полнотекстовый индекс
+    MIN_TOKEN_LENGTH = 3
+
     def __init__(self, filename="notes.json"):
         """Инициализирует хранилище заметок.
-        
+
         Args:
             filename (str, optional): Имя файла для хранения. По умолчанию "notes.json".
         """
         self.filename = filename
+        self._raw_cache = None
+        self._cache = None
+        self._mtime = None
+        self._by_id = {}
+        self._max_id = None
+        self._search_index = None
+        self._columns = None
+        self._version = 0
+
+    def _refresh_index(self, notes: List[Note]):
+        """Перестраивает индекс id→заметка и максимальный ID.
+
+        Args:
+            notes (List[Note]): Актуальный список заметок.
+        """
+        self._by_id = {note.id: note for note in notes}
+        self._max_id = max(self._by_id, default=0)
+        # Полнотекстовый индекс и колонки перестраиваются лениво
+        self._search_index = None
+        self._columns = None
+        self._version += 1
+
+    def get_columns(self) -> Tuple[tuple, tuple, tuple, tuple]:
+        """Возвращает колоночное представление заметок для фильтрации.
+
+        Вместо списка объектов — параллельные кортежи атрибутов,
+        отсортированные по дате создания (новые сначала). Обход плоских
+        кортежей при фильтрации дешевле обращения к атрибутам каждого
+        объекта, а кэш заметок уже поддерживается отсортированным,
+        поэтому сортировать заново не нужно.
+
+        Returns:
+            Tuple[tuple, tuple, tuple, tuple]: Кортежи (id, категории,
+                приоритеты, статусы) в едином порядке.
+        """
+        self.load_notes()
+        if self._columns is None:
+            ordered = list(reversed(self._cache))
+            self._columns = (
+                tuple(note.id for note in ordered),
+                tuple(note.category for note in ordered),
+                tuple(note.priority for note in ordered),
+                tuple(note.status for note in ordered)
+            )
+        return self._columns
+
+    def get_version(self) -> int:
+        """Возвращает номер версии данных хранилища.
+
+        Номер растет при каждом изменении набора заметок и служит
+        ключом инвалидации для кэшей производных результатов.
+
+        Returns:
+            int: Текущий номер версии.
+        """
+        self.load_notes()
+        return self._version
+
+    def _build_search_index(self) -> dict:
+        """Строит инвертированный индекс слово→множество ID заметок.
+
+        Индексируются слова заголовка, текста и тегов длиной не короче
+        MIN_TOKEN_LENGTH, в нижнем регистре.
+
+        Returns:
+            dict: Отображение слово→множество ID заметок.
+        """
+        index = {}
+        for note in self._cache:
+            text = " ".join([note.title_lc, note.content_lc, *note.tags_lc])
+            for token in set(_TOKEN_RE.findall(text)):
+                if len(token) >= self.MIN_TOKEN_LENGTH:
+                    index.setdefault(token, set()).add(note.id)
+        return index
+
+    def search_index(self, query: str) -> Optional[Set[int]]:
+        """Ищет заметки по словам запроса через инвертированный индекс.
+
+        Поиск пословный: каждое слово запроса должно встречаться в
+        заметке целиком (как в полнотекстовых индексах СУБД), частичные
+        совпадения внутри слов индекс не находит. Команда поиска
+        использует этот индекс в режиме целых слов (--word); обычный
+        поиск по подстроке идет мимо него.
+
+        Args:
+            query (str): Поисковый запрос.
+
+        Returns:
+            Optional[Set[int]]: Множество ID заметок, содержащих все
+                слова запроса, либо None, если запрос не подходит для
+                пословного поиска (нет слов или есть слово короче
+                MIN_TOKEN_LENGTH).
+        """
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens or any(len(token) < self.MIN_TOKEN_LENGTH for token in tokens):
+            return None
+
+        self.load_notes()
+        if self._search_index is None:
+            self._search_index = self._build_search_index()
+
+        result = self._search_index.get(tokens[0], set())
+        for token in tokens[1:]:
+            if not result:
+                break
+            result = result & self._search_index.get(token, set())
+        return set(result)
     
     def _ensure_file_exists(self):
         """Создает файл для хранения, если он не существует."""
@@ -33,46 +158,163 @@ class NoteStorage:
     
     def save_notes(self, notes: List[Note]):
         """Сохраняет список заметок в файл.
-        
+
+        Запись атомарна: данные пишутся во временный файл рядом с
+        целевым и подменяются через os.replace, поэтому сбой или
+        параллельное чтение не оставят файл наполовину записанным.
+        Вывод компактный, без отступов — это вдвое меньше байтов на
+        каждую запись по сравнению с форматированным JSON.
+
         Args:
             notes (List[Note]): Список объектов заметок для сохранения.
-            
+
         Raises:
             IOError: Если произошла ошибка при записи в файл.
             PermissionError: Если нет прав для записи в файл.
         """
+        ordered = sorted(notes, key=_CREATED_KEY)
+        payload = [note.to_dict() for note in ordered]
+        try:
+            self._write_payload(payload)
+        except Exception:
+            # Вызывающий код мог уже изменить закэшированные объекты
+            # (archive/edit правят Note на месте); при неудачной записи
+            # кэш сбрасывается, и следующий load перечитает файл
+            self._raw_cache = None
+            self._cache = None
+            self._mtime = None
+            self._max_id = None
+            raise
+        self._raw_cache = payload
+        self._cache = ordered
+        self._mtime = os.stat(self.filename).st_mtime
+        self._refresh_index(self._cache)
+
+    def _write_payload(self, payload: List[dict]):
+        """Атомарно сериализует и записывает список словарей в файл.
+
+        Args:
+            payload (List[dict]): Сериализуемые данные заметок.
+        """
+        if orjson is not None:
+            raw = orjson.dumps(payload)
+        else:
+            raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        tmp_filename = self.filename + '.tmp'
+        with open(tmp_filename, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_filename, self.filename)
+
+    def load_raw(self) -> List[dict]:
+        """Возвращает разобранное содержимое файла без объектов Note.
+
+        Для агрегирующих вызовов (следующий ID, сбор тегов) достаточно
+        словарей, а создание объектов Note — основная часть стоимости
+        загрузки. Возвращаемый список — внутренний кэш, изменять его
+        нельзя.
+
+        Returns:
+            List[dict]: Словари заметок в том виде, как они сохранены.
+        """
         self._ensure_file_exists()
-        with open(self.filename, 'w') as f:
-            json.dump([note.to_dict() for note in notes], f, indent=2)
-    
+        mtime = os.stat(self.filename).st_mtime
+        if self._raw_cache is None or mtime != self._mtime:
+            try:
+                with open(self.filename, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            except ValueError:
+                data = []
+            self._raw_cache = data
+            self._mtime = mtime
+            # Объекты Note пересоздаются лениво при следующем load_notes
+            self._cache = None
+            self._max_id = None
+        return self._raw_cache
+
     def load_notes(self) -> List[Note]:
         """Загружает заметки из файла.
-        
+
+        Результат кэшируется в памяти: повторные вызовы не перечитывают
+        и не разбирают файл заново, пока он не изменился на диске
+        (проверяется по времени модификации). Объекты Note создаются
+        из разобранных данных один раз и переиспользуются.
+
         Returns:
             List[Note]: Список загруженных заметок.
-            
-        Raises:
-            JSONDecodeError: Если файл содержит некорректный JSON.
-            KeyError: Если в данных отсутствуют обязательные поля.
         """
-        self._ensure_file_exists()
-        try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
-                return [Note.from_dict(note_data) for note_data in data]
-        except (json.JSONDecodeError, KeyError):
-            return []
-    
+        data = self.load_raw()
+        if self._cache is None:
+            try:
+                notes = [Note.from_dict(note_data) for note_data in data]
+            except KeyError:
+                notes = []
+            # Кэш держится отсортированным по дате создания; на уже
+            # упорядоченном файле это один линейный проход timsort
+            notes.sort(key=_CREATED_KEY)
+            self._cache = notes
+            self._refresh_index(notes)
+        return list(self._cache)
+
+    def append_note(self, note: Note):
+        """Добавляет одну заметку в хранилище одной операцией записи.
+
+        Работает поверх кэша разобранных данных: ради добавления одной
+        записи не перечитывается файл и не создаются объекты Note.
+
+        Args:
+            note (Note): Новая заметка для сохранения.
+        """
+        self.append_many([note])
+
+    def append_many(self, new_notes: List[Note]):
+        """Добавляет несколько заметок одной операцией записи.
+
+        Пакет любого размера обходится в одну сериализацию и одну
+        запись файла вместо записи на каждую заметку.
+
+        Args:
+            new_notes (List[Note]): Новые заметки для сохранения.
+        """
+        # Кэш обновляется только после успешной записи: если запись
+        # упадет, в памяти не останется несохраненных заметок
+        payload = self.load_raw() + [note.to_dict() for note in new_notes]
+        self._write_payload(payload)
+        self._raw_cache = payload
+        self._mtime = os.stat(self.filename).st_mtime
+        if self._cache is not None:
+            # Вставка с сохранением порядка; новые заметки обычно
+            # новее всех, так что bisect сразу попадает в конец
+            for note in new_notes:
+                insort(self._cache, note, key=_CREATED_KEY)
+            self._refresh_index(self._cache)
+        elif self._max_id is not None:
+            self._max_id = max(self._max_id, new_notes[-1].id)
+
     def get_next_id(self) -> int:
         """Генерирует следующий уникальный идентификатор для новой заметки.
-        
+
         Returns:
             int: Следующий доступный ID.
         """
-        notes = self.load_notes()
-        if not notes:
-            return 1
-        return max(note.id for note in notes) + 1
+        data = self.load_raw()
+        if self._max_id is None:
+            # Записи без id не роняют генерацию: такой файл load_notes
+            # тоже считает пустым, а не ошибочным
+            self._max_id = max((record.get('id', 0) for record in data), default=0)
+        return self._max_id + 1
+
+    def get_by_id(self, note_id: int) -> Optional[Note]:
+        """Возвращает заметку по идентификатору через индекс id→заметка.
+
+        Args:
+            note_id (int): ID искомой заметки.
+
+        Returns:
+            Optional[Note]: Заметка или None, если заметка не найдена.
+        """
+        self.load_notes()
+        return self._by_id.get(note_id)
     
     def get_all_tags(self) -> List[str]:
         """Возвращает список всех уникальных тегов из всех заметок.
@@ -80,8 +322,19 @@ class NoteStorage:
         Returns:
             List[str]: Отсортированный список уникальных тегов.
         """
-        notes = self.load_notes()
-        all_tags = set()
-        for note in notes:
-            all_tags.update(note.tags)
-        return sorted(list(all_tags))
\ No newline at end of file
+        return [tag for tag, _ in self.get_all_tags_with_counts()]
+
+    def get_all_tags_with_counts(self) -> List[Tuple[str, int]]:
+        """Возвращает все уникальные теги вместе с количеством заметок.
+
+        Индекс тег→количество строится за один проход по разобранным
+        данным, без повторного сканирования списка для каждого тега и
+        без создания объектов Note.
+
+        Returns:
+            List[Tuple[str, int]]: Отсортированные пары (тег, количество заметок).
+        """
+        counts = Counter()
+        for record in self.load_raw():
+            counts.update(record.get('tags', ()))
+        return sorted(counts.items())
\ No newline at end of file